@@ -44,6 +44,7 @@ class GeneralCommands(commands.Cog):
             "`!forget` - Erase the bot's memory of this server.",
             "`!chooseTone` - Choose a personality for the bot to use.",
             "`!getTone` - Check the bot's current personality.",
+            "`!modelStats` - Show per-model latency and escalation stats.",
         ]
         await ctx.send("**🤖 Available Commands:**\n" + "\n".join(commands_list))
 
@@ -8,6 +8,7 @@ from handlers.personalityhandler import PersonalityHandler
 from handlers.memory_handler import MemoryHandler
 from handlers.prompt_builder import PromptBuilder
 from handlers.response_handler import ResponseHandler
+from handlers.model_router import ModelRouter
 
 logger = logging.getLogger("reply")
 
@@ -18,6 +19,7 @@ class ReplyCommands(commands.Cog):
         self.personality_handler = PersonalityHandler()
         self.memory_handler = MemoryHandler()
         self.response_handler = ResponseHandler()
+        self.model_router = ModelRouter(self.response_handler)
 
     @commands.command(help='Ask the bot something or upload a file to get insights!')
     @commands.cooldown(1, 10, commands.BucketType.user)
@@ -73,6 +75,7 @@ class ReplyCommands(commands.Cog):
         else:
             instruction = self.personality_handler.AVAILABLE_PERSONALITIES["wholesome"]
             await ctx.send(f"⚠️ The personality `{selected_personality}` was not found. Falling back to `wholesome`.")
+            selected_personality = "wholesome"
 
         # Use fallback text if no question provided
         question = question or "(No specific question provided. Summarize or interpret the attached document.)"
@@ -101,7 +104,12 @@ class ReplyCommands(commands.Cog):
         # Send placeholder message while thinking
         thinking = await ctx.send("🧠 Thinking...")
         try:
-            reply = await asyncio.wait_for(self.response_handler.generate(prompt), timeout=60)
+            reply = await self.model_router.generate(
+                prompt,
+                question=question,
+                file_context=file_context,
+                personality=selected_personality
+            )
         except asyncio.TimeoutError:
             await thinking.edit(content="⏱️ The model took too long to respond.")
             return
@@ -128,6 +136,18 @@ class ReplyCommands(commands.Cog):
         # Send full response in chunks
         await self.send_long_message(ctx, cleaned_reply)
 
+    @commands.command(name='modelStats', help='Show per-model latency and escalation stats.')
+    async def model_stats(self, ctx):
+        lines = []
+        for tier_name, stats in self.model_router.get_stats().items():
+            lines.append(
+                f"`{tier_name}` ({stats['model']}) - {stats['calls']} calls, "
+                f"avg {stats['avg_latency']:.2f}s, max {stats['max_latency']:.2f}s, "
+                f"{stats['escalations']} escalations, {stats['timeouts']} timeouts, "
+                f"{stats['cancellations']} cancelled"
+            )
+        await ctx.send("**📊 Model Routing Stats:**\n" + "\n".join(lines))
+
     def clean_response(self, text):
         text = re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL | re.IGNORECASE).strip()
         return re.sub(r"^(Bot:|AI:|Assistant:|Response:)\s*", "", text, flags=re.IGNORECASE)
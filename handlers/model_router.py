@@ -0,0 +1,211 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger("model_router")
+
+DEFAULT_CONFIG = {
+    "tiers": [
+        {"name": "fast", "model": "llama3:latest", "timeout_seconds": 20},
+        {"name": "reasoning", "model": "deepseek-r1:latest", "timeout_seconds": 60}
+    ],
+    "thresholds": {
+        "max_fast_question_chars": 300,
+        "max_fast_questions": 1,
+        "min_reply_chars": 15,
+        "max_unsure_reply_chars": 200
+    },
+    "personalities": {}
+}
+
+# Questions that usually need multi-step reasoning rather than a quick answer
+REASONING_PATTERN = re.compile(
+    r"\b(why|explain|analy[sz]e|compare|prove|derive|step[- ]by[- ]step|"
+    r"calculate|solve|debug|optimi[sz]e|refactor|pros and cons)\b",
+    re.IGNORECASE
+)
+# Code-shaped text only (fences, inline code, definitions), not bare keywords like "class"
+CODE_PATTERN = re.compile(
+    r"```|`[^`\n]+`|\bdef\s+\w+\s*\(|\bfunction\s+\w+\s*\(|\bclass\s+\w+\s*[:({]|"
+    r"^\s*(from\s+[\w.]+\s+)?import\s+[\w.]+(\s+as\s+\w+)?\s*;?\s*$|\bSELECT\b.+\bFROM\b",
+    re.MULTILINE
+)
+# Short answers that give up instead of answering
+UNSURE_PATTERN = re.compile(
+    r"\b(i (do not|don't|dont) know|i'?m not sure|i am not sure|i (cannot|can't|am unable to) "
+    r"(answer|help|determine)|no idea)\b",
+    re.IGNORECASE
+)
+PROMPT_ECHO_MARKERS = ("[System Instruction]", "[User Question]", "[Expected Behavior]")
+THINK_PATTERN = re.compile(r"<think>.*?</think>", re.DOTALL | re.IGNORECASE)
+
+
+class ModelRouter:
+    def __init__(self, response_handler, config_path="utility/model_tiers.json"):
+        self.response_handler = response_handler
+        self.config = self.load_config(config_path)
+        self.tiers = self.config["tiers"]
+        self.thresholds = self.config["thresholds"]
+        self.personality_tiers = self.config["personalities"]
+        self.stats = {
+            tier["name"]: {
+                "calls": 0, "escalations": 0, "timeouts": 0, "cancellations": 0,
+                "total_latency": 0.0, "max_latency": 0.0
+            }
+            for tier in self.tiers
+        }
+
+    def load_config(self, config_path):
+        """Load tier configuration, falling back to defaults for missing or invalid entries."""
+        config = {key: (value.copy() if isinstance(value, dict) else list(value))
+                  for key, value in DEFAULT_CONFIG.items()}
+        if os.path.exists(config_path):
+            with open(config_path) as f:
+                user_config = json.load(f)
+            config["tiers"] = self.validate_tiers(user_config.get("tiers")) or config["tiers"]
+            config["thresholds"].update(user_config.get("thresholds", {}))
+            config["personalities"].update(user_config.get("personalities", {}))
+
+        tier_names = {tier["name"] for tier in config["tiers"]}
+        personalities = {}
+        for personality, tier_name in config["personalities"].items():
+            if tier_name not in tier_names:
+                logger.warning(f"Personality '{personality}' maps to unknown tier '{tier_name}', ignoring it")
+                continue
+            personalities[personality.lower()] = tier_name
+        config["personalities"] = personalities
+        return config
+
+    def validate_tiers(self, tiers):
+        """Keep only tiers with a unique name and a model; warn about the rest."""
+        valid = []
+        for tier in tiers or []:
+            if not isinstance(tier, dict) or not tier.get("name") or not tier.get("model"):
+                logger.warning(f"Skipping model tier without a 'name' and 'model': {tier}")
+                continue
+            if any(existing["name"] == tier["name"] for existing in valid):
+                logger.warning(f"Skipping duplicate model tier '{tier['name']}'")
+                continue
+            valid.append(tier)
+        if tiers and not valid:
+            logger.warning("No valid model tiers configured, using defaults")
+        return valid
+
+    def tier_index(self, name):
+        for index, tier in enumerate(self.tiers):
+            if tier["name"] == name:
+                return index
+        return None
+
+    def classify(self, question, file_context="", personality=None):
+        """Pick the starting tier index for a request using cheap local features."""
+        reasoning = len(self.tiers) - 1
+
+        forced = self.tier_index(self.personality_tiers.get((personality or "").lower()))
+        if forced is not None:
+            return forced
+
+        if file_context:
+            return reasoning
+        if len(question) > self.thresholds["max_fast_question_chars"]:
+            return reasoning
+        if question.count("?") > self.thresholds["max_fast_questions"]:
+            return reasoning
+        if REASONING_PATTERN.search(question) or CODE_PATTERN.search(question):
+            return reasoning
+        return 0
+
+    def is_acceptable(self, reply, question=""):
+        """Reject errored, short, echoed or "I don't know" answers so they can be escalated."""
+        if self.response_handler.is_error(reply):
+            return False
+        answer = THINK_PATTERN.sub("", reply).strip()
+        if len(answer) < self.thresholds["min_reply_chars"]:
+            return False
+        if any(marker in answer for marker in PROMPT_ECHO_MARKERS):
+            return False
+        if self.normalize(answer) == self.normalize(question):
+            return False
+        if len(answer) <= self.thresholds["max_unsure_reply_chars"] and UNSURE_PATTERN.search(answer):
+            return False
+        return True
+
+    @staticmethod
+    def normalize(text):
+        return re.sub(r"[\W_]+", " ", text).strip().lower()
+
+    async def generate(self, prompt, question, file_context="", personality=None):
+        """Generate a reply starting at the classified tier, escalating on poor answers.
+
+        Each tier gets its own timeout; a timeout on the last tier is re-raised.
+        """
+        start_index = self.classify(question, file_context, personality)
+        reply = ""
+        for index in range(start_index, len(self.tiers)):
+            tier = self.tiers[index]
+            is_last = index + 1 == len(self.tiers)
+            try:
+                reply = await self.call_tier(tier, prompt)
+            except asyncio.TimeoutError:
+                if is_last:
+                    raise
+                reply = ""
+
+            if self.is_acceptable(reply, question):
+                return reply
+            if not is_last:
+                self.stats[tier["name"]]["escalations"] += 1
+                logger.info(f"Escalating from '{tier['name']}' to '{self.tiers[index + 1]['name']}'")
+        return reply
+
+    async def call_tier(self, tier, prompt):
+        """Call a single tier, recording its latency even if the call is cut short."""
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await asyncio.wait_for(
+                self.response_handler.generate(prompt, model_name=tier["model"]),
+                timeout=tier.get("timeout_seconds", 60)
+            )
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            self.record(tier["name"], time.perf_counter() - started, outcome=outcome)
+
+    def record(self, tier_name, latency, outcome="ok"):
+        stats = self.stats[tier_name]
+        stats["calls"] += 1
+        stats["total_latency"] += latency
+        stats["max_latency"] = max(stats["max_latency"], latency)
+        if outcome == "timeout":
+            stats["timeouts"] += 1
+            logger.info(f"[{tier_name}] timed out after {latency:.2f}s")
+        elif outcome == "cancelled":
+            stats["cancellations"] += 1
+            logger.info(f"[{tier_name}] cancelled after {latency:.2f}s")
+        else:
+            logger.info(f"[{tier_name}] responded in {latency:.2f}s")
+
+    def get_stats(self):
+        """Return per-tier call counts, escalations and latency summaries."""
+        summary = {}
+        for tier in self.tiers:
+            stats = self.stats[tier["name"]]
+            calls = stats["calls"]
+            summary[tier["name"]] = {
+                "model": tier["model"],
+                "calls": calls,
+                "escalations": stats["escalations"],
+                "timeouts": stats["timeouts"],
+                "cancellations": stats["cancellations"],
+                "avg_latency": stats["total_latency"] / calls if calls else 0.0,
+                "max_latency": stats["max_latency"]
+            }
+        return summary
@@ -4,13 +4,16 @@ import logging
 logger = logging.getLogger("response_handler")
 
 class ResponseHandler:
+    NO_RESPONSE = "🤖 No response from model."
+    ERROR_PREFIX = "❌"
+
     def __init__(self, api_url='http://localhost:11434/api/generate', model_name='deepseek-r1:latest'):
         self.api_url = api_url
         self.model_name = model_name
 
-    async def generate(self, prompt):
+    async def generate(self, prompt, model_name=None):
         payload = {
-            "model": self.model_name,
+            "model": model_name or self.model_name,
             "prompt": prompt,
             "stream": False
         }
@@ -19,9 +22,14 @@ class ResponseHandler:
             async with aiohttp.ClientSession() as session:
                 async with session.post(self.api_url, json=payload) as resp:
                     if resp.status != 200:
-                        return f"❌ Error {resp.status}: Could not reach DeepSeek."
+                        return f"{self.ERROR_PREFIX} Error {resp.status}: Could not reach DeepSeek."
                     data = await resp.json()
-                    return data.get("response", "🤖 No response from model.")
+                    return data.get("response", self.NO_RESPONSE)
         except Exception as e:
             logger.error(f"[DeepSeek Error] {e}")
-            return f"❌ Error contacting DeepSeek: {e}"
+            return f"{self.ERROR_PREFIX} Error contacting DeepSeek: {e}"
+
+    @classmethod
+    def is_error(cls, reply):
+        """Check whether a reply is an error or placeholder rather than model output."""
+        return not reply or reply.startswith(cls.ERROR_PREFIX) or reply == cls.NO_RESPONSE